@@ -0,0 +1,352 @@
+# builder.py
+"""
+LMS export builders for the ``mcq`` and ``parsons`` directives.
+
+    make moodle    ->  _build/moodle/moodle-0001.xml, moodle-0002.xml, ...
+    make qti       ->  _build/qti/qti-0001.zip, qti-0002.zip, ...   (QTI 2.1 content packages)
+
+Questions are streamed out document by document: each doctree is read,
+its questions are written straight to the open chunk file and the doctree
+is dropped, so memory stays flat however many questions the site has.
+A new chunk file is started every ``lms_export_chunk_size`` questions.
+"""
+import abc
+import glob
+import os
+import re
+import zipfile
+from xml.sax.saxutils import escape, quoteattr
+
+from sphinx.builders import Builder
+from sphinx.util import logging
+
+from questions import is_single_select, iter_questions
+
+logger = logging.getLogger(__name__)
+
+
+# ─────────────────────────────────────
+# HTML helpers
+# ─────────────────────────────────────
+def stem_html(blocks):
+    return "".join(
+        f"<pre><code>{escape(text)}</code></pre>" if kind == "code" else f"<p>{escape(text)}</p>"
+        for kind, text in blocks
+    )
+
+
+def code_line_html(indent, code):
+    return "&#160;" * (4 * indent) + f"<code>{escape(code)}</code>"
+
+
+# ─────────────────────────────────────
+# Base builder
+# ─────────────────────────────────────
+class LMSExportBuilder(Builder, abc.ABC):
+    """
+    Streams questions into numbered chunk files in ``outdir``.
+
+    Subclasses open and close one chunk file at a time (``self.chunk``)
+    and write each question into it.
+    """
+
+    allow_parallel = False
+    chunk_suffix = ""
+
+    def init(self):
+        self.chunk = None
+        self.chunk_index = 0
+        self.chunk_count = 0
+        self.total = 0
+
+    def get_outdated_docs(self):
+        # Chunks are rewritten from scratch, so every document is exported.
+        return self.env.found_docs
+
+    def get_target_uri(self, docname, typ=None):
+        return ""
+
+    def prepare_writing(self, docnames):
+        os.makedirs(self.outdir, exist_ok=True)
+        for stale in glob.glob(os.path.join(self.outdir, f"{self.name}-*{self.chunk_suffix}")):
+            os.remove(stale)
+
+    def write_doc(self, docname, doctree):
+        for n, question in enumerate(iter_questions(doctree), start=1):
+            if self.chunk is not None and self.chunk_count >= self.config.lms_export_chunk_size:
+                self.close_chunk()
+            if self.chunk is None:
+                self.chunk_index += 1
+                self.chunk_count = 0
+                path = os.path.join(self.outdir, f"{self.name}-{self.chunk_index:04d}{self.chunk_suffix}")
+                self.chunk = self.open_chunk(path)
+
+            ident = self.identifier(docname, n)
+            if question["type"] == "mcq":
+                self.write_mcq(docname, ident, question)
+            else:
+                self.write_parsons(docname, ident, question)
+            self.chunk_count += 1
+            self.total += 1
+
+    def finish(self):
+        if self.chunk is not None:
+            self.close_chunk()
+        logger.info(f"{self.name}: exported {self.total} questions into {self.chunk_index} file(s)")
+
+    @staticmethod
+    def identifier(docname, n):
+        # XML identifiers must start with a letter and contain no slashes
+        return "Q_" + re.sub(r"[^A-Za-z0-9_.-]", "_", docname) + f"_{n}"
+
+    @abc.abstractmethod
+    def open_chunk(self, path):
+        """Create the chunk file at ``path`` and return the open handle."""
+
+    @abc.abstractmethod
+    def close_chunk(self):
+        """Finish and close ``self.chunk``, then set it to None."""
+
+    @abc.abstractmethod
+    def write_mcq(self, docname, ident, question):
+        """Write one MCQ (a dict from ``iter_questions``) to ``self.chunk``."""
+
+    @abc.abstractmethod
+    def write_parsons(self, docname, ident, question):
+        """Write one Parsons puzzle to ``self.chunk``."""
+
+
+# ─────────────────────────────────────
+# Moodle XML
+# ─────────────────────────────────────
+class MoodleXMLBuilder(LMSExportBuilder):
+    name = "moodle"
+    format = "moodle"
+    epilog = "The Moodle XML files are in %(outdir)s."
+    chunk_suffix = ".xml"
+
+    def open_chunk(self, path):
+        self.category = None
+        f = open(path, "w", encoding="utf-8")
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n<quiz>\n')
+        return f
+
+    def close_chunk(self):
+        self.chunk.write("</quiz>\n")
+        self.chunk.close()
+        self.chunk = None
+
+    def write_category(self, docname):
+        # Re-emitted at the top of each chunk so every file imports on its own
+        if self.category == docname:
+            return
+        self.category = docname
+        title = self.env.titles[docname].astext() if docname in self.env.titles else docname
+        path = f"$course$/top/{self.config.project}/{title}"
+        self.chunk.write(
+            '<question type="category">\n'
+            f"  <category><text>{escape(path)}</text></category>\n"
+            "</question>\n"
+        )
+
+    def write_question_header(self, qtype, ident, name, text):
+        self.chunk.write(
+            f'<question type="{qtype}">\n'
+            f"  <name><text>{escape(name or ident)}</text></name>\n"
+            f'  <questiontext format="html"><text>{escape(text)}</text></questiontext>\n'
+            f"  <idnumber>{escape(ident)}</idnumber>\n"
+        )
+
+    def write_mcq(self, docname, ident, question):
+        self.write_category(docname)
+        text = f"<p>{escape(question['question'])}</p>" + stem_html(question["stem"])
+        self.write_question_header("multichoice", ident, question["question"], text)
+
+        single = is_single_select(question)
+        choices = question["choices"]
+        n_correct = sum(ch["correct"] for ch in choices) or 1
+        n_wrong = (len(choices) - n_correct) or 1
+
+        self.chunk.write(
+            f"  <single>{str(single).lower()}</single>\n"
+            f"  <shuffleanswers>{int(question['shuffle'])}</shuffleanswers>\n"
+            f"  <answernumbering>{'ABCD' if question['letters'] else 'none'}</answernumbering>\n"
+        )
+        for ch in choices:
+            if ch["correct"]:
+                fraction = 100 if single else 100 / n_correct
+            else:
+                fraction = 0 if single else -100 / n_wrong
+            self.chunk.write(
+                f'  <answer fraction="{fraction:.5g}" format="html">\n'
+                f"    <text>{escape(escape(ch['text']))}</text>\n"
+            )
+            if ch["explanation"]:
+                self.chunk.write(
+                    f'    <feedback format="html"><text>{escape(escape(ch["explanation"]))}</text></feedback>\n'
+                )
+            self.chunk.write("  </answer>\n")
+        self.chunk.write("</question>\n")
+
+    def write_parsons(self, docname, ident, question):
+        # Uses the widely installed "ordering" question type (qtype_ordering)
+        self.write_category(docname)
+        self.write_question_header(
+            "ordering", ident, question["title"],
+            f"<p>{escape(question['title'])}</p><p>Put the lines in the correct order.</p>",
+        )
+        self.chunk.write(
+            "  <layouttype>VERTICAL</layouttype>\n"
+            "  <selecttype>ALL</selecttype>\n"
+            "  <selectcount>0</selectcount>\n"
+            "  <gradingtype>ABSOLUTE_POSITION</gradingtype>\n"
+        )
+        for indent, code in question["expected"]:
+            self.chunk.write(
+                f'  <answer fraction="0" format="html"><text>{escape(code_line_html(indent, code))}</text></answer>\n'
+            )
+        self.chunk.write("</question>\n")
+
+
+# ─────────────────────────────────────
+# QTI 2.1
+# ─────────────────────────────────────
+QTI_NS = (
+    'xmlns="http://www.imsglobal.org/xsd/imsqti_v2p1" '
+    'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" '
+    'xsi:schemaLocation="http://www.imsglobal.org/xsd/imsqti_v2p1 '
+    'http://www.imsglobal.org/xsd/qti/qtiv2p1/imsqti_v2p1.xsd"'
+)
+
+
+class QTIBuilder(LMSExportBuilder):
+    name = "qti"
+    format = "qti"
+    epilog = "The QTI 2.1 content packages are in %(outdir)s."
+    chunk_suffix = ".zip"
+
+    def open_chunk(self, path):
+        self.resources = []
+        return zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED)
+
+    def close_chunk(self):
+        # Only the identifiers of this chunk are held in memory
+        resources = "".join(
+            f'    <resource identifier="{ident}" type="imsqti_item_xmlv2p1" href="{ident}.xml">'
+            f'<file href="{ident}.xml"/></resource>\n'
+            for ident in self.resources
+        )
+        manifest = (
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            f'<manifest xmlns="http://www.imsglobal.org/xsd/imscp_v1p1" '
+            f'identifier="{self.name}-{self.chunk_index:04d}">\n'
+            "  <organizations/>\n"
+            f"  <resources>\n{resources}  </resources>\n"
+            "</manifest>\n"
+        )
+        self.chunk.writestr("imsmanifest.xml", manifest)
+        self.chunk.close()
+        self.chunk = None
+
+    def write_item(self, ident, title, declarations, body, processing):
+        self.chunk.writestr(
+            f"{ident}.xml",
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            f"<assessmentItem {QTI_NS} identifier={quoteattr(ident)} title={quoteattr(title or ident)} "
+            'adaptive="false" timeDependent="false">\n'
+            f"{declarations}"
+            f"<itemBody>\n{body}</itemBody>\n"
+            f"{processing}"
+            "</assessmentItem>\n",
+        )
+        self.resources.append(ident)
+
+    def write_mcq(self, docname, ident, question):
+        single = is_single_select(question)
+        choices = question["choices"]
+        ids = [chr(ord("A") + i) for i in range(len(choices))]
+        correct = [cid for cid, ch in zip(ids, choices) if ch["correct"]]
+        n_wrong = (len(choices) - len(correct)) or 1
+
+        # Mapping scores every correct choice, so radio mode with several
+        # correct answers still grades any of them as right.
+        entries = []
+        for cid, ch in zip(ids, choices):
+            if ch["correct"]:
+                value = 1 if single else 1 / len(correct)
+            else:
+                value = 0 if single else -1 / n_wrong
+            entries.append(f'<mapEntry mapKey="{cid}" mappedValue="{value:.5g}"/>')
+
+        cardinality = "single" if single else "multiple"
+        correct_values = "".join(f"<value>{cid}</value>" for cid in (correct[:1] if single else correct))
+        declarations = (
+            f'<responseDeclaration identifier="RESPONSE" cardinality="{cardinality}" baseType="identifier">\n'
+            f"  <correctResponse>{correct_values}</correctResponse>\n"
+            f'  <mapping lowerBound="0" upperBound="1" defaultValue="0">{"".join(entries)}</mapping>\n'
+            "</responseDeclaration>\n"
+            '<outcomeDeclaration identifier="SCORE" cardinality="single" baseType="float"/>\n'
+            '<outcomeDeclaration identifier="FEEDBACK" cardinality="multiple" baseType="identifier"/>\n'
+        )
+
+        simple_choices = []
+        for cid, ch in zip(ids, choices):
+            feedback = ""
+            if ch["explanation"]:
+                feedback = (
+                    f'<feedbackInline outcomeIdentifier="FEEDBACK" identifier="{cid}" showHide="show">'
+                    f"{escape(ch['explanation'])}</feedbackInline>"
+                )
+            simple_choices.append(f'  <simpleChoice identifier="{cid}">{escape(ch["text"])}{feedback}</simpleChoice>\n')
+
+        body = (
+            f"<p>{escape(question['question'])}</p>{stem_html(question['stem'])}\n"
+            f'<choiceInteraction responseIdentifier="RESPONSE" shuffle="{str(question["shuffle"]).lower()}" '
+            f'maxChoices="{1 if single else 0}">\n'
+            f"{''.join(simple_choices)}"
+            "</choiceInteraction>\n"
+        )
+        response = "<variable identifier=\"RESPONSE\"/>"
+        feedback_value = f"<multiple>{response}</multiple>" if single else response
+        processing = (
+            "<responseProcessing>\n"
+            '  <setOutcomeValue identifier="SCORE"><mapResponse identifier="RESPONSE"/></setOutcomeValue>\n'
+            f'  <setOutcomeValue identifier="FEEDBACK">{feedback_value}</setOutcomeValue>\n'
+            "</responseProcessing>\n"
+        )
+        self.write_item(ident, question["question"], declarations, body, processing)
+
+    def write_parsons(self, docname, ident, question):
+        ids = [f"L{i}" for i in range(1, len(question["expected"]) + 1)]
+        declarations = (
+            '<responseDeclaration identifier="RESPONSE" cardinality="ordered" baseType="identifier">\n'
+            f"  <correctResponse>{''.join(f'<value>{lid}</value>' for lid in ids)}</correctResponse>\n"
+            "</responseDeclaration>\n"
+            '<outcomeDeclaration identifier="SCORE" cardinality="single" baseType="float"/>\n'
+        )
+        lines = "".join(
+            f'  <simpleChoice identifier="{lid}">{code_line_html(indent, code)}</simpleChoice>\n'
+            for lid, (indent, code) in zip(ids, question["expected"])
+        )
+        body = (
+            f"<p>{escape(question['title'])}</p>\n"
+            '<orderInteraction responseIdentifier="RESPONSE" shuffle="true">\n'
+            "<prompt>Put the lines in the correct order.</prompt>\n"
+            f"{lines}"
+            "</orderInteraction>\n"
+        )
+        processing = (
+            '<responseProcessing template="http://www.imsglobal.org/question/qti_v2p1/rptemplates/match_correct"/>\n'
+        )
+        self.write_item(ident, question["title"], declarations, body, processing)
+
+
+# ─────────────────────────────────────
+# Setup
+# ─────────────────────────────────────
+def setup(app):
+    app.add_config_value("lms_export_chunk_size", 500, "")
+    app.add_builder(MoodleXMLBuilder)
+    app.add_builder(QTIBuilder)
+
+    return {"version": "1.0", "parallel_read_safe": True, "parallel_write_safe": True}
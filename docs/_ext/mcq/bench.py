@@ -0,0 +1,104 @@
+# bench.py
+"""
+Benchmark for ``MCQDirective.run`` on a synthetic 10,000-question project.
+
+The corpus has 100 documents with 100 ``.. mcq::`` blocks each, split evenly
+between the stem kinds the directive handles differently:
+
+- ``none``   choices only
+- ``prose``  a plain paragraph stem (the inline fast path)
+- ``code``   a paragraph plus a ``code-block`` (full nested parse)
+
+The project is built with the dummy builder in a temporary directory and the
+time spent in ``MCQDirective.run`` is reported per kind.
+
+Run ``python bench.py`` (or ``python bench.py --docs 10`` for a quicker run).
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sphinx.cmd.build import build_main  # noqa: E402
+
+from mcq import mcq  # noqa: E402
+
+STEMS = {
+    "none": [],
+    "prose": ["Consider the statement below.", ""],
+    "code": [
+        "What does this print?",
+        "",
+        ".. code-block:: python",
+        "",
+        "   d = {'a': 1}",
+        "   print(d.get('b', 0))",
+        "",
+    ],
+}
+KINDS = ["none", "none", "prose", "code"]
+
+
+def synthetic_document(doc, questions):
+    lines = [f"Questions {doc}", "=" * 20, ""]
+    for q in range(questions):
+        lines += [".. mcq::", f"   :question: Question {doc}.{q}", ""]
+        lines += [f"   {line}" if line else "" for line in STEMS[KINDS[q % len(KINDS)]]]
+        lines += [f"   [ ] a{q}", f"   [x] b{q} | yes", f"   [ ] c{q}", f"   [ ] d{q}", ""]
+    return "\n".join(lines)
+
+
+def write_project(srcdir, docs, questions):
+    with open(os.path.join(srcdir, "conf.py"), "w", encoding="utf-8") as f:
+        f.write('extensions = ["mcq.mcq"]\n')
+    names = [f"q{doc:03d}" for doc in range(docs)]
+    with open(os.path.join(srcdir, "index.rst"), "w", encoding="utf-8") as f:
+        f.write("Benchmark\n=========\n\n.. toctree::\n\n")
+        f.writelines(f"   {name}\n" for name in names)
+    for doc, name in enumerate(names):
+        with open(os.path.join(srcdir, f"{name}.rst"), "w", encoding="utf-8") as f:
+            f.write(synthetic_document(doc, questions))
+
+
+def benchmark(docs=100, questions=100):
+    stats = {kind: [0, 0.0] for kind in STEMS}
+    run = mcq.MCQDirective.run
+
+    def timed_run(self):
+        body = "\n".join(self.content)
+        kind = "code" if "code-block" in body else "prose" if "Consider" in body else "none"
+        start = time.perf_counter()
+        result = run(self)
+        stats[kind][0] += 1
+        stats[kind][1] += time.perf_counter() - start
+        return result
+
+    mcq.MCQDirective.run = timed_run
+    try:
+        with tempfile.TemporaryDirectory() as srcdir:
+            write_project(srcdir, docs, questions)
+            start = time.perf_counter()
+            status = build_main(["-q", "-E", "-b", "dummy", srcdir, os.path.join(srcdir, "_build")])
+            elapsed = time.perf_counter() - start
+    finally:
+        mcq.MCQDirective.run = run
+    if status:
+        sys.exit(status)
+
+    for kind, (count, total) in stats.items():
+        if count:
+            print(f"{kind:6s} {count:6d} x {total / count * 1e6:6.0f} us")
+    count = sum(count for count, _ in stats.values())
+    total = sum(total for _, total in stats.values())
+    print(f"{'all':6s} {count:6d} x {total / count * 1e6:6.0f} us   (build {elapsed:.1f} s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--docs", type=int, default=100, help="number of documents")
+    parser.add_argument("--questions", type=int, default=100, help="questions per document")
+    args = parser.parse_args()
+    benchmark(args.docs, args.questions)
@@ -2,12 +2,16 @@
 import html
 import os
 import random
+import re
 import hashlib
 from docutils import nodes
 from docutils.parsers.rst import directives
-from docutils.statemachine import ViewList
+from docutils.statemachine import StringList
+from sphinx.util import logging
 from sphinx.util.docutils import SphinxDirective
 
+logger = logging.getLogger(__name__)
+
 # ─────────────────────────────────────
 # Node
 # ─────────────────────────────────────
@@ -29,6 +33,123 @@ def visit_mcq_html(self, node):
 def depart_mcq_html(self, node):
     self.body.append("</div>")
 
+def choice_marker(node, i):
+    """Printed marker for choice ``i``: a letter, or an empty box to tick."""
+    if node.get("letters"):
+        return f"{chr(ord('A') + i)})"
+    return "( )" if node.get("force_radio") or node.get("single_correct") else "[ ]"
+
+# ─────────────────────────────────────
+# LaTeX Visitors
+# (the raw HTML children are skipped by the LaTeX writer; the stem
+# container is rendered between visit and depart)
+# ─────────────────────────────────────
+def visit_mcq_latex(self, node):
+    self.body.append(
+        "\n\\par\\noindent\\textbf{" + self.encode(node.get("question", "")) + "}\\par\n"
+    )
+
+def depart_mcq_latex(self, node):
+    choices = node.get("choices", [])
+    if not choices:
+        return
+    self.body.append("\\begin{itemize}\n")
+    for i, ch in enumerate(choices):
+        self.body.append(f"\\item[{{{self.encode(choice_marker(node, i))}}}] {self.encode(ch['text'])}\n")
+    self.body.append("\\end{itemize}\n")
+
+# ─────────────────────────────────────
+# Text Visitors
+# ─────────────────────────────────────
+def visit_mcq_text(self, node):
+    self.new_state(0)
+    self.add_text(node.get("question", ""))
+    self.end_state()
+
+def depart_mcq_text(self, node):
+    choices = node.get("choices", [])
+    for i, ch in enumerate(choices):
+        marker = choice_marker(node, i)
+        self.new_state(len(marker) + 1)
+        self.add_text(ch["text"])
+        self.end_state(first=f"{marker} ", end=[""] if i == len(choices) - 1 else None)
+
+# ─────────────────────────────────────
+# Body tokenizer
+# ─────────────────────────────────────
+CHOICE_RE = re.compile(r"\[(.?)\]\s*(.*)")
+
+def tokenize_mcq(content):
+    """
+    Split an mcq body into stem and choices in a single pass.
+
+    Returns ``(stem, choices)``. ``stem`` is a StringList of the prose and
+    code lines in source order, each keeping its own source/offset so
+    nested_parse reports errors at the right line; it is empty when the
+    question has no body. ``choices`` are dicts with ``text``, ``correct``,
+    ``explanation``, ``source`` and ``line`` (1-based).
+
+    An unindented ``.. directive::`` or a line ending in ``::`` opens a
+    block: following indented and blank lines belong to it, so ``[x]``
+    inside code is never taken for a choice.
+    """
+    stem_lines, stem_items, choices = [], [], []
+    in_block = False
+
+    for line, (source, offset) in zip(content.data, content.items):
+        stripped = line.strip()
+        indented = line[:1] in (" ", "\t")
+
+        if in_block and (indented or not stripped):
+            stem_lines.append(line)
+            stem_items.append((source, offset))
+            continue
+        in_block = False
+
+        if not indented:
+            match = CHOICE_RE.match(stripped) if stripped[:1] == "[" else None
+            if match:
+                marker, remainder = match.groups()
+                if marker not in " xX":
+                    logger.warning(
+                        f"mcq: unknown choice marker [{marker}], expected [ ] or [x]",
+                        location=f"{source}:{offset + 1}",
+                    )
+                text, _, explanation = remainder.partition("|")
+                choices.append({
+                    "text": text.strip(),
+                    "correct": marker.lower() == "x",
+                    "explanation": explanation.strip() or None,
+                    "source": source,
+                    "line": offset + 1,
+                })
+                continue
+            in_block = stripped.startswith(".. ") or stripped.endswith("::")
+
+        stem_lines.append(line)
+        stem_items.append((source, offset))
+
+    # Drop blank lines around the stem; an all-blank stem means no body
+    start, end = 0, len(stem_lines)
+    while start < end and not stem_lines[start].strip():
+        start += 1
+    while end > start and not stem_lines[end - 1].strip():
+        end -= 1
+    return StringList(stem_lines[start:end], items=stem_items[start:end]), choices
+
+ENUMERATOR_RE = re.compile(r"[A-Za-z]{1,4}[.)]\s")
+
+def is_plain_paragraph(stem):
+    """
+    True if the stem can only parse as one plain paragraph: unindented
+    lines that start with a letter (so no lists, fields, tables, titles or
+    directives) and no literal-block marker.
+    """
+    for line in stem.data:
+        if not line[:1].isalpha() or ENUMERATOR_RE.match(line):
+            return False
+    return not stem.data[-1].rstrip().endswith("::")
+
 # ─────────────────────────────────────
 # Directive
 # ─────────────────────────────────────
@@ -48,67 +169,38 @@ class MCQDirective(SphinxDirective):
         node["question"] = self.options.get("question", "")
         node["force_radio"] = "radio" in self.options
         node["letters"] = "letters" in self.options
+        node["shuffle"] = "shuffle" in self.options
 
-        # Extract content
-        choices = []
-        non_choice_lines = []
-        inside_code = False
-        code_lines = []
-
-        for line in self.content:
-            stripped = line.rstrip()
-
-            # Handle code blocks
-            if stripped.startswith(".. code-block::") or stripped.endswith("::"):
-                inside_code = True
-                code_lines.append(line)
-                continue
-
-            if inside_code:
-                if line.startswith("   ") or line.startswith("\t") or not line.strip():
-                    code_lines.append(line)
-                    continue
-                else:
-                    inside_code = False
-
-            # Choice parsing
-            if not inside_code and stripped.startswith("[") and "]" in stripped:
-                choices.append(stripped)
-            else:
-                non_choice_lines.append(line)
-
-        # Insert non-choice content (e.g., code)
-        if non_choice_lines or code_lines:
-            vl = ViewList()
-            for i, l in enumerate(non_choice_lines + code_lines, start=self.content_offset):
-                vl.append(l, self.state.document.current_source, i)
+        # Split the body into stem (prose + code, in order) and choices
+        stem, choices = tokenize_mcq(self.content)
 
+        # Only parse the stem when there is one. A plain paragraph only
+        # needs inline parsing; anything else goes through nested_parse.
+        if stem:
             container = nodes.container()
-            self.state.nested_parse(vl, self.content_offset, container)
+            if is_plain_paragraph(stem):
+                text = "\n".join(stem.data)
+                source, offset = stem.items[0]
+                textnodes, messages = self.state.inline_text(text, offset + 1)
+                para = nodes.paragraph(text, "", *textnodes)
+                para.source, para.line = source, offset + 1
+                container += para
+                container += messages
+            else:
+                self.state.nested_parse(stem, self.content_offset, container)
             node += container
 
         # Shuffle choices
         if "shuffle" in self.options:
             random.shuffle(choices)
 
-        # Parse choices
-        parsed = []
-        for ch in choices:
-            marker = ch[1].lower()
-            is_correct = marker == "x"
-            remainder = ch[ch.index("]") + 1:].strip()
+        parsed = [
+            {"text": ch["text"], "correct": ch["correct"], "explanation": ch["explanation"]}
+            for ch in choices
+        ]
 
-            if "|" in remainder:
-                text, explanation = remainder.split("|", 1)
-                text, explanation = text.strip(), explanation.strip()
-            else:
-                text, explanation = remainder, None
-
-            parsed.append({
-                "text": text,
-                "correct": is_correct,
-                "explanation": explanation
-            })
+        # Keep the parsed choices on the node for non-HTML builders
+        node["choices"] = parsed
 
         # Determine answer mode
         correct_count = sum(c["correct"] for c in parsed)
@@ -126,7 +218,8 @@ class MCQDirective(SphinxDirective):
         # Radio group name
         radio_group = hashlib.md5(node["question"].encode("utf-8")).hexdigest()
 
-        # Generate HTML
+        # Generate HTML (one raw node for all the choices)
+        choices_html = []
         for i, ch in enumerate(parsed):
             letter = chr(ord("A") + i) if node["letters"] else ""
 
@@ -154,7 +247,10 @@ class MCQDirective(SphinxDirective):
                 )
 
             html_str += "</div>"
-            node += nodes.raw("", html_str, format="html")
+            choices_html.append(html_str)
+
+        if choices_html:
+            node += nodes.raw("", "".join(choices_html), format="html")
 
         return [node]
 
@@ -163,7 +259,12 @@ class MCQDirective(SphinxDirective):
 # Setup
 # ─────────────────────────────────────
 def setup(app):
-    app.add_node(mcq_node, html=(visit_mcq_html, depart_mcq_html))
+    app.add_node(
+        mcq_node,
+        html=(visit_mcq_html, depart_mcq_html),
+        latex=(visit_mcq_latex, depart_mcq_latex),
+        text=(visit_mcq_text, depart_mcq_text),
+    )
     app.add_directive("mcq", MCQDirective)
 
     static_path = os.path.join(os.path.dirname(__file__), "_static")
@@ -0,0 +1 @@
+from .report import setup
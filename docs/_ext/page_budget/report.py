@@ -0,0 +1,157 @@
+# report.py
+"""
+Per-page output budget report for HTML builds.
+
+On build-finished every page in the output is measured:
+
+- ``html_bytes``   size of the page itself
+- ``widgets``      number of MCQ and Parsons widgets on the page
+- ``dom_nodes``    element count (an estimate of the DOM size)
+- ``asset_bytes``  total size of the local JS/CSS files the page references
+
+The report is written to ``<outdir>/page_budget.json``. Each page is
+checked against ``page_budget`` (absolute limits) and against the baseline
+JSON (``page_budget_baseline``, growth above ``page_budget_max_growth_percent``).
+Problems are logged as warnings; with ``page_budget_fail = True`` (or
+``-D page_budget_fail=1``) they also fail the build.
+
+The baseline is committed next to conf.py and is only (re)written when
+``page_budget_update_baseline`` is set (``-D page_budget_update_baseline=1``).
+Without it, only the absolute limits are checked.
+"""
+import json
+import os
+from html.parser import HTMLParser
+from urllib.parse import urlsplit
+
+from sphinx.util import logging
+
+logger = logging.getLogger(__name__)
+
+# Metrics compared against the baseline; widget counts only change with content
+GROWTH_METRICS = ("html_bytes", "dom_nodes", "asset_bytes")
+WIDGET_CLASSES = {"mcq-block", "parsons-container"}
+
+
+class PageScanner(HTMLParser):
+    """Counts elements and widgets and collects JS/CSS references in one pass."""
+
+    def __init__(self):
+        super().__init__()
+        self.dom_nodes = 0
+        self.widgets = 0
+        self.assets = set()
+
+    def handle_starttag(self, tag, attrs):
+        self.dom_nodes += 1
+        attrs = dict(attrs)
+        if WIDGET_CLASSES.intersection((attrs.get("class") or "").split()):
+            self.widgets += 1
+        if tag == "script" and attrs.get("src"):
+            self.assets.add(attrs["src"])
+        elif tag == "link" and "stylesheet" in (attrs.get("rel") or "") and attrs.get("href"):
+            self.assets.add(attrs["href"])
+
+    handle_startendtag = handle_starttag
+
+
+def measure_page(path, asset_sizes):
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    scanner = PageScanner()
+    scanner.feed(text)
+    scanner.close()
+
+    asset_bytes = 0
+    for ref in scanner.assets:
+        url = urlsplit(ref)
+        if url.scheme or url.netloc:
+            continue  # external (CDN) assets are not in the output
+        asset = os.path.normpath(os.path.join(os.path.dirname(path), url.path))
+        if asset not in asset_sizes:
+            asset_sizes[asset] = os.path.getsize(asset) if os.path.isfile(asset) else 0
+        asset_bytes += asset_sizes[asset]
+
+    return {
+        "html_bytes": os.path.getsize(path),
+        "widgets": scanner.widgets,
+        "dom_nodes": scanner.dom_nodes,
+        "asset_bytes": asset_bytes,
+    }
+
+
+def check_page(page, metrics, budget, baseline, max_growth_percent):
+    problems = []
+    for metric, limit in budget.items():
+        # -D page_budget.html_bytes=1000 arrives as a string
+        limit = int(limit)
+        if metric in metrics and metrics[metric] > limit:
+            problems.append(f"{page}: {metric} {metrics[metric]} exceeds budget {limit}")
+
+    before = baseline.get(page)
+    if before:
+        for metric in GROWTH_METRICS:
+            old, new = before.get(metric), metrics[metric]
+            if old and (new - old) * 100 / old > max_growth_percent:
+                problems.append(
+                    f"{page}: {metric} grew {(new - old) / old:.0%} vs baseline ({old} -> {new})"
+                )
+    return problems
+
+
+def report_page_budget(app, exception):
+    if exception is not None or app.builder.format != "html":
+        return
+    config = app.config
+
+    report = {}
+    asset_sizes = {}
+    for docname in sorted(app.env.found_docs):
+        path = app.builder.get_outfilename(docname)
+        if os.path.isfile(path):
+            report[docname] = measure_page(path, asset_sizes)
+
+    with open(os.path.join(app.outdir, "page_budget.json"), "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+
+    baseline_path = os.path.join(app.confdir, config.page_budget_baseline)
+    baseline = {}
+    if config.page_budget_update_baseline:
+        with open(baseline_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+            f.write("\n")
+        logger.info(f"page budget: baseline written to {baseline_path}")
+    elif os.path.isfile(baseline_path):
+        with open(baseline_path, encoding="utf-8") as f:
+            baseline = json.load(f)
+    else:
+        logger.info(
+            f"page budget: no baseline at {baseline_path}, growth not checked "
+            "(create it with -D page_budget_update_baseline=1)"
+        )
+
+    problems = []
+    for docname, metrics in report.items():
+        problems += check_page(
+            docname, metrics, config.page_budget, baseline, config.page_budget_max_growth_percent
+        )
+
+    for problem in problems:
+        logger.warning(f"page budget: {problem}")
+    if problems and config.page_budget_fail:
+        logger.error(f"page budget: {len(problems)} problem(s), failing the build (page_budget_fail)")
+        app.statuscode = 1
+
+
+# ─────────────────────────────────────
+# Setup
+# ─────────────────────────────────────
+def setup(app):
+    app.add_config_value("page_budget", {}, "")
+    app.add_config_value("page_budget_max_growth_percent", 25, "")
+    app.add_config_value("page_budget_baseline", "page_budget_baseline.json", "")
+    app.add_config_value("page_budget_update_baseline", False, "")
+    app.add_config_value("page_budget_fail", False, "")
+    app.connect("build-finished", report_page_budget)
+
+    return {"version": "1.0", "parallel_read_safe": True, "parallel_write_safe": True}
@@ -1,8 +1,68 @@
+import html
 from docutils import nodes
 from docutils.parsers.rst import Directive, directives
 import random
 
 
+class parsons_node(nodes.General, nodes.Element):
+    pass
+
+
+def visit_parsons_html(self, node):
+    expected_attr = "|".join(f"{indent}::{code}" for indent, code in node["expected"])
+    shuffle_attr = "true" if node["shuffle_js"] else "false"
+    self.body.append(
+        f'<div class="parsons-container parsons-cols-{node["columns"]}" '
+        f'data-expected="{html.escape(expected_attr)}" data-shuffle-js="{shuffle_attr}">'
+    )
+
+
+def depart_parsons_html(self, node):
+    self.body.append("</div>")
+
+
+def printable_lines(expected):
+    """
+    Shuffle the expected lines for print and number them 1..N.
+
+    The shuffle is seeded from the puzzle itself, so a worksheet and its
+    answer key always agree. Returns ``(lines, answer)``: ``lines`` is
+    ``[(number, code)]`` in printed order, ``answer`` is
+    ``[(number, indent)]`` in the correct order.
+    """
+    order = list(range(len(expected)))
+    random.Random("\n".join(code for _, code in expected)).shuffle(order)
+    number = {idx: n for n, idx in enumerate(order, start=1)}
+    lines = [(number[idx], expected[idx][1]) for idx in order]
+    answer = [(number[idx], indent) for idx, (indent, _) in enumerate(expected)]
+    return lines, answer
+
+
+# The visitors below replace the HTML-only children (raw <li> lines,
+# target columns and buttons) with a numbered list of shuffled lines.
+def visit_parsons_latex(self, node):
+    lines, _ = printable_lines(node["expected"])
+    self.body.append("\n\\par\\noindent\\textbf{" + self.encode(node["title"]) + "}\\par\n")
+    if lines:
+        self.body.append("\\begin{itemize}\n")
+        for number, code in lines:
+            self.body.append(f"\\item[{number}.] \\texttt{{{self.encode(code)}}}\n")
+        self.body.append("\\end{itemize}\n")
+    raise nodes.SkipNode
+
+
+def visit_parsons_text(self, node):
+    lines, _ = printable_lines(node["expected"])
+    self.new_state(0)
+    self.add_text(node["title"])
+    self.end_state()
+    for i, (number, code) in enumerate(lines):
+        self.new_state(len(str(number)) + 2)
+        self.add_text(code)
+        self.end_state(wrap=False, first=f"{number}. ", end=[""] if i == len(lines) - 1 else None)
+    raise nodes.SkipNode
+
+
 class ParsonsDirective(Directive):
     has_content = True
     optional_arguments = 0
@@ -30,6 +90,10 @@ class ParsonsDirective(Directive):
             labels = [lbl.strip() for lbl in labels_opt.split(",")]
 
         # Preserve original order for solution
+        # Indentation is read after any "- " marker and stored as a level
+        # (the rank of its width among the widths used, so 0/4/6 spaces are
+        # levels 0/1/2) so parsons.js can compare it with the arrow-key
+        # indent of each line.
         expected_order = []
         for line in self.content:
             if not line.strip():
@@ -37,25 +101,26 @@ class ParsonsDirective(Directive):
             if line.strip().startswith("- "):
                 raw = line.strip()[2:]
             else:
-                raw = line.strip()
-            indent = len(line) - len(line.lstrip(" "))
-            expected_order.append((indent, raw))
+                raw = line
+            indent = len(raw) - len(raw.lstrip(" "))
+            expected_order.append((indent, raw.strip()))
+
+        widths = sorted({0} | {indent for indent, _ in expected_order})
+        level = {width: rank for rank, width in enumerate(widths)}
+        expected_order = [(level[indent], code) for indent, code in expected_order]
 
         lines = [(indent, code, idx+1) for idx, (indent, code) in enumerate(expected_order)]
 
         if shuffle:
             random.shuffle(lines)
 
-        expected_attr = "|".join(f"{indent}::{code}" for indent, code in expected_order)
-        shuffle_attr = "true" if shuffle_js else "false"
-
-        # Open container
-        open_div = nodes.raw(
-            "",
-            f'<div class="parsons-container parsons-cols-{columns}" '
-            f'data-expected="{expected_attr}" data-shuffle-js="{shuffle_attr}">',
-            format="html",
-        )
+        # Container (opened/closed by the HTML visitors); the expected
+        # order is kept on the node so non-HTML builders can read it.
+        node = parsons_node()
+        node["title"] = title
+        node["expected"] = expected_order
+        node["columns"] = columns
+        node["shuffle_js"] = shuffle_js
 
         # Title
         title_para = nodes.paragraph()
@@ -115,12 +180,17 @@ class ParsonsDirective(Directive):
             format="html",
         )
 
-        close_div = nodes.raw("", "</div>", format="html")
-
-        return [open_div, title_para, source_ul, target_wrapper, controls, close_div]
+        node += [title_para, source_ul, target_wrapper, controls]
+        return [node]
 
 
 def setup(app):
+    app.add_node(
+        parsons_node,
+        html=(visit_parsons_html, depart_parsons_html),
+        latex=(visit_parsons_latex, None),
+        text=(visit_parsons_text, None),
+    )
     app.add_directive("parsons", ParsonsDirective)
     app.add_css_file("parsons/parsons.css")
     app.add_js_file("parsons/parsons.js")
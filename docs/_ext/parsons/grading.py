@@ -0,0 +1,140 @@
+# grading.py
+"""
+Python reference for the partial-credit grading done by ``check()`` in
+``_static/parsons/parsons.js``.
+
+Both implementations follow the same steps:
+
+1. Map every submitted line to its expected position. Lines with identical
+   text are interchangeable, so the k-th submitted copy of a line is matched
+   to the k-th expected copy.
+2. Take the longest increasing subsequence (O(n log n)) of those positions.
+   Lines on it are in order; every other line is the minimal set of
+   misplaced lines.
+3. Compare indentation separately, so a line can be in order but
+   wrongly indented.
+
+Run ``python grading.py`` to benchmark on synthetic 500-line puzzles.
+"""
+import random
+import time
+from bisect import bisect_left
+from collections import defaultdict, deque
+
+
+def norm(s):
+    """Same whitespace normalisation as ``norm()`` in parsons.js."""
+    s = (s or "").replace("\u00A0", " ").replace("\t", "    ")
+    return " ".join(s.split())
+
+
+def expected_positions(expected, submitted):
+    """
+    Map each submitted ``(indent, text)`` line to its index in ``expected``.
+
+    Lines that do not appear in ``expected`` (or appear more often than
+    expected) map to ``None``.
+    """
+    slots = defaultdict(deque)
+    for idx, (_, text) in enumerate(expected):
+        slots[norm(text)].append(idx)
+
+    positions = []
+    for _, text in submitted:
+        queue = slots.get(norm(text))
+        positions.append(queue.popleft() if queue else None)
+    return positions
+
+
+def longest_increasing_subsequence(values):
+    """
+    Return the indices into ``values`` of one longest strictly increasing
+    subsequence. ``None`` entries are skipped.
+    """
+    tails = []      # tails[k] = smallest tail value of an increasing run of length k+1
+    tail_idx = []   # index into values of that tail
+    prev = [-1] * len(values)
+
+    for i, v in enumerate(values):
+        if v is None:
+            continue
+        k = bisect_left(tails, v)
+        if k == len(tails):
+            tails.append(v)
+            tail_idx.append(i)
+        else:
+            tails[k] = v
+            tail_idx[k] = i
+        prev[i] = tail_idx[k - 1] if k else -1
+
+    result = []
+    i = tail_idx[-1] if tail_idx else -1
+    while i != -1:
+        result.append(i)
+        i = prev[i]
+    result.reverse()
+    return result
+
+
+def grade(expected, submitted):
+    """
+    Grade a submitted answer against the expected solution.
+
+    ``expected`` and ``submitted`` are lists of ``(indent, text)`` tuples.
+    Returns a dict with one ``{"placed", "indent_ok", "correct"}`` entry per
+    submitted line under ``"lines"``, plus ``"misplaced"``,
+    ``"indent_errors"``, ``"missing"``, ``"correct"`` and ``"score"``
+    (0.0 – 1.0, correct lines over expected lines).
+    """
+    positions = expected_positions(expected, submitted)
+    in_order = set(longest_increasing_subsequence(positions))
+
+    lines = []
+    for i, ((indent, _), pos) in enumerate(zip(submitted, positions)):
+        placed = i in in_order
+        indent_ok = pos is not None and indent == expected[pos][0]
+        lines.append({
+            "placed": placed,
+            "indent_ok": indent_ok,
+            "correct": placed and indent_ok,
+        })
+
+    correct = sum(line["correct"] for line in lines)
+    return {
+        "lines": lines,
+        "misplaced": sum(not line["placed"] for line in lines),
+        "indent_errors": sum(line["placed"] and not line["indent_ok"] for line in lines),
+        "missing": len(expected) - sum(pos is not None for pos in positions),
+        "correct": correct,
+        "score": correct / len(expected) if expected else 1.0,
+    }
+
+
+# ─────────────────────────────────────
+# Benchmark
+# ─────────────────────────────────────
+def synthetic_puzzle(n, swaps, rng):
+    """Build an ``n``-line puzzle and a submission with ``swaps`` random swaps."""
+    expected = [(i % 4, f"line_{i % (n // 5 or 1)} = {i % 7}") for i in range(n)]
+    submitted = list(expected)
+    for _ in range(swaps):
+        a, b = rng.randrange(n), rng.randrange(n)
+        submitted[a], submitted[b] = submitted[b], submitted[a]
+    return expected, submitted
+
+
+def benchmark(n=500, runs=200, seed=0):
+    rng = random.Random(seed)
+    puzzles = [synthetic_puzzle(n, rng.randrange(n // 10), rng) for _ in range(runs)]
+
+    start = time.perf_counter()
+    for expected, submitted in puzzles:
+        grade(expected, submitted)
+    elapsed = time.perf_counter() - start
+
+    print(f"{runs} x {n}-line puzzles: {elapsed * 1000:.1f} ms total, "
+          f"{elapsed / runs * 1000:.3f} ms per grade")
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,101 @@
+# test_grading.py
+"""
+Tests for the Parsons grading reference, and a parity check against
+``gradeLines()`` in ``_static/parsons/parsons.js`` (needs node).
+
+    python -m pytest docs/_ext/parsons
+"""
+import json
+import os
+import shutil
+import subprocess
+
+import pytest
+
+from parsons.grading import grade
+
+PARSONS_JS = os.path.join(os.path.dirname(__file__), "..", "..", "_static", "parsons", "parsons.js")
+
+EXPECTED = [(0, "def f(xs):"), (1, "total = 0"), (1, "for x in xs:"), (2, "total += x"), (1, "return total")]
+
+CASES = {
+    "correct": (EXPECTED, list(EXPECTED)),
+    "duplicate lines": (
+        [(0, "if a:"), (1, "pass"), (0, "if b:"), (1, "pass")],
+        [(0, "if b:"), (1, "pass"), (0, "if a:"), (1, "pass"), (1, "pass")],
+    ),
+    "indent only": (
+        EXPECTED,
+        [(0, "def f(xs):"), (1, "total = 0"), (1, "for x in xs:"), (1, "total += x"), (1, "return total")],
+    ),
+    "reversed": (EXPECTED, EXPECTED[::-1]),
+    "empty submission": (EXPECTED, []),
+}
+
+
+def test_correct_answer_scores_full():
+    result = grade(*CASES["correct"])
+    assert result["correct"] == len(EXPECTED)
+    assert result["misplaced"] == result["indent_errors"] == result["missing"] == 0
+    assert result["score"] == 1.0
+
+
+def test_duplicate_lines_are_interchangeable():
+    result = grade(*CASES["duplicate lines"])
+    # Each "pass" takes the next unused expected copy, so the swapped
+    # blocks map to positions 2, 1, 0, 3: two lines stay in order. The
+    # extra third "pass" has no expected slot left.
+    assert result["lines"][-1]["placed"] is False
+    assert result["misplaced"] == 3
+    assert result["correct"] == 2
+    assert result["missing"] == 0
+
+
+def test_indent_error_is_reported_separately():
+    result = grade(*CASES["indent only"])
+    assert result["misplaced"] == 0
+    assert result["indent_errors"] == 1
+    assert [line["correct"] for line in result["lines"]] == [True, True, True, False, True]
+    assert result["score"] == pytest.approx(4 / 5)
+
+
+def test_reversed_order_keeps_one_line():
+    result = grade(*CASES["reversed"])
+    # The longest increasing run of a reversed list is a single line
+    assert result["misplaced"] == len(EXPECTED) - 1
+    assert sum(line["placed"] for line in result["lines"]) == 1
+
+
+def test_empty_submission():
+    result = grade(*CASES["empty submission"])
+    assert result["lines"] == []
+    assert result["missing"] == len(EXPECTED)
+    assert result["score"] == 0.0
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="node is not installed")
+@pytest.mark.parametrize("name", sorted(CASES))
+def test_matches_parsons_js(name):
+    expected, submitted = CASES[name]
+    script = (
+        "const fs = require('fs');"
+        "global.document = { addEventListener() {} };"
+        "eval(fs.readFileSync(process.argv[1], 'utf8'));"
+        "const [e, s] = JSON.parse(process.argv[2]);"
+        "const toLine = ([indent, text]) => ({ indent, text });"
+        "console.log(JSON.stringify(gradeLines(e.map(toLine), s.map(toLine))));"
+    )
+    out = subprocess.run(
+        ["node", "-e", script, PARSONS_JS, json.dumps([expected, submitted])],
+        capture_output=True, text=True, check=True,
+    ).stdout
+    js = json.loads(out)
+    py = grade(expected, submitted)
+
+    assert [(l["placed"], l["indentOk"], l["correct"]) for l in js["lines"]] == [
+        (l["placed"], l["indent_ok"], l["correct"]) for l in py["lines"]
+    ]
+    assert (js["misplaced"], js["indentErrors"], js["correct"]) == (
+        py["misplaced"], py["indent_errors"], py["correct"]
+    )
+    assert js["score"] == pytest.approx(py["score"])
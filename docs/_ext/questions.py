@@ -0,0 +1,71 @@
+# questions.py
+"""
+Plain-dict model of the ``mcq`` and ``parsons`` questions in a doctree.
+
+Shared by the LMS export and worksheet builders and the quiz search index,
+so none of them depends on another. Not a Sphinx extension itself.
+"""
+from docutils import nodes
+
+from mcq.mcq import mcq_node
+from parsons.directive import parsons_node
+
+
+def stem_blocks(node):
+    """
+    The stem content (prose and code) nested inside an mcq node, as a list
+    of ``("code" | "text", text)`` pairs.
+    """
+    stem = next((child for child in node.children if isinstance(child, nodes.container)), None)
+    if stem is None:
+        return []
+
+    blocks = []
+    for child in stem.children:
+        if isinstance(child, nodes.literal_block):
+            blocks.append(("code", child.astext()))
+        elif isinstance(child, nodes.container):
+            # e.g. the literal-block-wrapper of a code-block with :caption:
+            blocks += [("text", caption.astext()) for caption in child.findall(nodes.caption)]
+            blocks += [("code", code.astext()) for code in child.findall(nodes.literal_block)]
+        elif child.astext().strip():
+            blocks.append(("text", child.astext()))
+    return blocks
+
+
+def question_from_node(node):
+    """Plain dict for one ``mcq_node`` or ``parsons_node``."""
+    if isinstance(node, mcq_node):
+        return {
+            "type": "mcq",
+            "question": node.get("question", ""),
+            "stem": stem_blocks(node),
+            "choices": node.get("choices", []),
+            "single_correct": node.get("single_correct", False),
+            "force_radio": node.get("force_radio", False),
+            "letters": node.get("letters", False),
+            "shuffle": node.get("shuffle", False),
+        }
+    return {
+        "type": "parsons",
+        "title": node.get("title", "Parsons Puzzle"),
+        "expected": node.get("expected", []),
+    }
+
+
+def iter_question_nodes(doctree):
+    return doctree.findall(lambda n: isinstance(n, (mcq_node, parsons_node)))
+
+
+def iter_questions(doctree):
+    """
+    Yield one plain dict per ``mcq_node`` / ``parsons_node`` in ``doctree``,
+    in document order.
+    """
+    for node in iter_question_nodes(doctree):
+        yield question_from_node(node)
+
+
+def is_single_select(question):
+    """Radio buttons or the custom single-select mode: one answer is chosen."""
+    return question["force_radio"] or question["single_correct"]
@@ -0,0 +1,113 @@
+/* ============================================================
+   Quiz search
+   Searches MCQ / Parsons text from the sharded index written by
+   _ext/quiz_search/index.py. Nothing is loaded until a query is
+   run; then only the manifest (fetched once and cached) and the
+   shards that may hold every query term are fetched.
+   ============================================================ */
+
+(() => {
+  const root = document.documentElement.dataset.content_root || "./";
+  const base = `${root}_static/quiz-search/`;
+
+  function queryTerms(query) {
+    return Array.from(new Set((query.toLowerCase().match(/\w+/g) || [])));
+  }
+
+  /* ============================================================
+     Shard selection (term prefix -> shard ids)
+     ============================================================ */
+  let manifestPromise = null;
+
+  function loadManifest() {
+    if (!manifestPromise) {
+      manifestPromise = fetch(`${base}manifest.json`)
+        .then(r => r.json())
+        .catch(err => {
+          manifestPromise = null; // retry on the next query
+          throw err;
+        });
+    }
+    return manifestPromise;
+  }
+
+  function shardsForTerm(manifest, term) {
+    const n = manifest.prefix_length;
+    if (term.length >= n) return new Set(manifest.prefixes[term.slice(0, n)] || []);
+    // Shorter than a key: any prefix starting with the term may match
+    const ids = new Set();
+    Object.keys(manifest.prefixes).forEach(key => {
+      if (key.startsWith(term)) manifest.prefixes[key].forEach(id => ids.add(id));
+    });
+    return ids;
+  }
+
+  function selectShards(manifest, terms) {
+    let ids = shardsForTerm(manifest, terms[0]);
+    terms.slice(1).forEach(t => {
+      const more = shardsForTerm(manifest, t);
+      ids = new Set([...ids].filter(id => more.has(id)));
+    });
+    return [...ids].sort((a, b) => a - b).map(id => manifest.shards[id]);
+  }
+
+  function matches(entry, terms) {
+    const words = entry.text.toLowerCase().match(/\w+/g) || [];
+    return terms.every(t => words.some(w => w.startsWith(t)));
+  }
+
+  async function search(query) {
+    const terms = queryTerms(query);
+    if (!terms.length) return [];
+
+    const manifest = await loadManifest();
+    const needed = selectShards(manifest, terms);
+
+    const shards = await Promise.all(
+      needed.map(s => fetch(base + s.file).then(r => r.json()))
+    );
+    return shards.flat().filter(entry => matches(entry, terms));
+  }
+
+  /* ============================================================
+     Rendering
+     ============================================================ */
+  function render(results, query) {
+    const anchor = document.getElementById("search-results");
+    if (!anchor || !results.length) return;
+
+    const box = document.createElement("div");
+    box.id = "quiz-search-results";
+
+    const heading = document.createElement("h2");
+    heading.textContent = `Quiz questions matching “${query}”`;
+    box.appendChild(heading);
+
+    const list = document.createElement("ul");
+    list.className = "search";
+    results.forEach(entry => {
+      const li = document.createElement("li");
+      const link = document.createElement("a");
+      link.href = root + entry.url;
+      link.textContent = entry.title;
+      li.appendChild(link);
+      if (entry.section) {
+        const where = document.createElement("span");
+        where.textContent = ` — ${entry.section}`;
+        li.appendChild(where);
+      }
+      list.appendChild(li);
+    });
+    box.appendChild(list);
+
+    anchor.after(box);
+  }
+
+  document.addEventListener("DOMContentLoaded", () => {
+    const query = new URLSearchParams(window.location.search).get("q");
+    if (!query) return;
+    search(query)
+      .then(results => render(results, query))
+      .catch(err => console.warn("quiz search unavailable:", err));
+  });
+})();
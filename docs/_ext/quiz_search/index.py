@@ -0,0 +1,171 @@
+# index.py
+"""
+Sharded search index for quiz content.
+
+MCQ and Parsons content is emitted as raw HTML, so Sphinx's own search
+never sees it. This extension collects the text of every question while
+documents are read and, after an HTML build, writes it to a separate index
+instead of inflating searchindex.js:
+
+    _static/quiz-search/manifest.json   shard list + term prefix -> shard ids
+    _static/quiz-search/<section>-<n>.json
+
+Shards are split by site section (the top-level folder of the document)
+and hold at most ``quiz_search_shard_size`` questions each. quiz-search.js
+is only added to the search page; it loads the manifest when a query is
+run and fetches just the shards that may contain every query term.
+
+The manifest maps the first ``PREFIX_LENGTH`` characters of each term to
+the shards holding such a term, so its size grows with the number of
+distinct prefixes rather than with the vocabulary of every shard:
+
+    {"prefix_length": 2,
+     "shards": [{"file": "info-1.json", "section": "info"}, ...],
+     "prefixes": {"di": [0, 3], "pr": [0], ...}}
+"""
+import json
+import os
+import re
+import shutil
+
+from docutils import nodes
+from sphinx.util import logging
+
+from questions import iter_question_nodes, question_from_node
+
+logger = logging.getLogger(__name__)
+
+TERM_RE = re.compile(r"\w+")
+PREFIX_LENGTH = 2
+
+
+def terms(text):
+    return set(TERM_RE.findall(text.lower()))
+
+
+def question_text(question):
+    if question["type"] == "mcq":
+        parts = [question["question"]] + [text for _, text in question["stem"]]
+        for ch in question["choices"]:
+            parts.append(ch["text"])
+            if ch["explanation"]:
+                parts.append(ch["explanation"])
+        return question["question"], "\n".join(parts)
+    return question["title"], "\n".join([question["title"]] + [code for _, code in question["expected"]])
+
+
+def enclosing_section(node):
+    while node is not None and not isinstance(node, nodes.section):
+        node = node.parent
+    return node
+
+
+# ─────────────────────────────────────
+# Collect while reading
+# ─────────────────────────────────────
+def collect_quiz_text(app, doctree):
+    env = app.env
+    if not hasattr(env, "quiz_search_entries"):
+        env.quiz_search_entries = {}
+
+    entries = []
+    for node in iter_question_nodes(doctree):
+        title, text = question_text(question_from_node(node))
+        section = enclosing_section(node)
+        entries.append({
+            "title": title,
+            "text": text,
+            "anchor": section["ids"][0] if section is not None and section["ids"] else "",
+            "section": section[0].astext() if section is not None and len(section) else "",
+        })
+    if entries:
+        env.quiz_search_entries[env.docname] = entries
+    else:
+        env.quiz_search_entries.pop(env.docname, None)
+
+
+def purge_quiz_text(app, env, docname):
+    if hasattr(env, "quiz_search_entries"):
+        env.quiz_search_entries.pop(docname, None)
+
+
+def merge_quiz_text(app, env, docnames, other):
+    if not hasattr(env, "quiz_search_entries"):
+        env.quiz_search_entries = {}
+    if hasattr(other, "quiz_search_entries"):
+        env.quiz_search_entries.update(other.quiz_search_entries)
+
+
+# ─────────────────────────────────────
+# Write shards after the build
+# ─────────────────────────────────────
+def site_section(docname):
+    return docname.split("/", 1)[0] if "/" in docname else "main"
+
+
+def write_quiz_index(app, exception):
+    if exception is not None or app.builder.format != "html":
+        return
+
+    outdir = os.path.join(app.outdir, "_static", "quiz-search")
+    shutil.rmtree(outdir, ignore_errors=True)
+    os.makedirs(outdir)
+
+    by_section = {}
+    for docname in sorted(getattr(app.env, "quiz_search_entries", {})):
+        if docname not in app.env.found_docs:
+            continue
+        url = app.builder.get_target_uri(docname)
+        for entry in app.env.quiz_search_entries[docname]:
+            by_section.setdefault(site_section(docname), []).append({
+                "title": entry["title"],
+                "section": entry["section"],
+                "url": url + (f"#{entry['anchor']}" if entry["anchor"] else ""),
+                "text": entry["text"],
+            })
+
+    size = app.config.quiz_search_shard_size
+    shards = []
+    prefixes = {}
+    for section, entries in sorted(by_section.items()):
+        for n, start in enumerate(range(0, len(entries), size), start=1):
+            chunk = entries[start:start + size]
+            name = f"{re.sub(r'[^A-Za-z0-9_-]', '_', section)}-{n}.json"
+            with open(os.path.join(outdir, name), "w", encoding="utf-8") as f:
+                json.dump(chunk, f, ensure_ascii=False, separators=(",", ":"))
+            shard_prefixes = set()
+            for entry in chunk:
+                shard_prefixes |= {term[:PREFIX_LENGTH] for term in terms(entry["text"])}
+            for prefix in shard_prefixes:
+                prefixes.setdefault(prefix, []).append(len(shards))
+            shards.append({"file": name, "section": section})
+
+    manifest = {"prefix_length": PREFIX_LENGTH, "shards": shards, "prefixes": prefixes}
+    with open(os.path.join(outdir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+
+    logger.info(f"quiz search: {sum(map(len, by_section.values()))} questions in {len(shards)} shard(s)")
+
+
+def add_search_script(app, pagename, templatename, context, doctree):
+    # Only the search page needs it
+    if pagename == "search":
+        app.add_js_file("quiz-search.js", loading_method="defer")
+
+
+# ─────────────────────────────────────
+# Setup
+# ─────────────────────────────────────
+def setup(app):
+    app.add_config_value("quiz_search_shard_size", 200, "")
+    app.connect("doctree-read", collect_quiz_text)
+    app.connect("env-purge-doc", purge_quiz_text)
+    app.connect("env-merge-info", merge_quiz_text)
+    app.connect("html-page-context", add_search_script)
+    app.connect("build-finished", write_quiz_index)
+
+    static_path = os.path.join(os.path.dirname(__file__), "_static")
+    if static_path not in app.config.html_static_path:
+        app.config.html_static_path.append(static_path)
+
+    return {"version": "1.0", "parallel_read_safe": True, "parallel_write_safe": True}
@@ -0,0 +1,261 @@
+# builder.py
+"""
+Printable worksheet builder for the ``mcq`` and ``parsons`` directives.
+
+    make worksheet  ->  _build/worksheet/worksheet.html    answer-key.html
+                                         worksheet.tex     answer-key.tex
+
+MCQs are lettered A, B, C, ...; Parsons puzzles are printed as shuffled,
+numbered lines and the answer key gives the line numbers in the correct
+order. Questions are streamed document by document straight into the four
+output files, with a page break every ``worksheet_questions_per_page``
+questions, so memory stays bounded however large the question bank is.
+"""
+import os
+from html import escape
+
+from sphinx.builders import Builder
+from sphinx.util import logging
+
+from parsons.directive import printable_lines
+from questions import is_single_select, iter_questions
+
+logger = logging.getLogger(__name__)
+
+
+def letter(i):
+    return chr(ord("A") + i)
+
+
+# ─────────────────────────────────────
+# HTML
+# ─────────────────────────────────────
+HTML_STYLE = """
+body { font-family: sans-serif; max-width: 50em; margin: 2em auto; }
+.page { page-break-after: always; break-after: page; }
+.page:last-child { page-break-after: auto; break-after: auto; }
+.question { break-inside: avoid; margin-bottom: 1.5em; }
+.choices, .lines { list-style: none; padding-left: 1.5em; }
+.correct { font-weight: bold; }
+.explanation { color: #555; font-size: 0.9em; margin-left: 1.5em; }
+pre, code { font-family: monospace; }
+@media screen { .page { border-bottom: 1px dashed #999; margin-bottom: 2em; } }
+"""
+
+
+class HTMLWorksheet:
+    def __init__(self, path, title, answer_key):
+        self.answer_key = answer_key
+        self.page_open = False
+        self.f = open(path, "w", encoding="utf-8")
+        self.f.write(
+            "<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\">\n"
+            f"<title>{escape(title)}</title>\n<style>{HTML_STYLE}</style>\n"
+            f"</head><body>\n<h1>{escape(title)}</h1>\n"
+        )
+
+    def open_page(self):
+        if not self.page_open:
+            self.f.write('<section class="page">\n')
+            self.page_open = True
+
+    def page_break(self):
+        if self.page_open:
+            self.f.write("</section>\n")
+            self.page_open = False
+
+    def heading(self, text):
+        self.open_page()
+        self.f.write(f"<h2>{escape(text)}</h2>\n")
+
+    def mcq(self, number, question):
+        self.open_page()
+        f = self.f
+        f.write(f'<div class="question"><p><strong>{number}.</strong> {escape(question["question"])}</p>\n')
+        for kind, text in question["stem"]:
+            f.write(f"<pre>{escape(text)}</pre>\n" if kind == "code" else f"<p>{escape(text)}</p>\n")
+        f.write('<ul class="choices">\n')
+        for i, ch in enumerate(question["choices"]):
+            css = ' class="correct"' if self.answer_key and ch["correct"] else ""
+            f.write(f"<li{css}>{letter(i)}) {escape(ch['text'])}")
+            if self.answer_key and ch["explanation"]:
+                f.write(f'<div class="explanation">{escape(ch["explanation"])}</div>')
+            f.write("</li>\n")
+        f.write("</ul>\n")
+        if self.answer_key:
+            answer = ", ".join(letter(i) for i, ch in enumerate(question["choices"]) if ch["correct"])
+            hint = " (choose one)" if is_single_select(question) else ""
+            f.write(f"<p>Answer{hint}: <strong>{answer}</strong></p>\n")
+        f.write("</div>\n")
+
+    def parsons(self, number, question):
+        self.open_page()
+        f = self.f
+        lines, answer = printable_lines(question["expected"])
+        f.write(f'<div class="question"><p><strong>{number}.</strong> {escape(question["title"])}</p>\n')
+        f.write('<ol class="lines">\n')
+        if self.answer_key:
+            code = dict(lines)
+            for n, indent in answer:
+                f.write(f"<li>{n}. <code>{'&#160;' * 4 * indent}{escape(code[n])}</code></li>\n")
+        else:
+            for n, text in lines:
+                f.write(f"<li>{n}. <code>{escape(text)}</code></li>\n")
+        f.write("</ol>\n")
+        if self.answer_key:
+            f.write(f"<p>Answer: <strong>{', '.join(str(n) for n, _ in answer)}</strong></p>\n")
+        else:
+            f.write("<p>Correct order: ______________________________</p>\n")
+        f.write("</div>\n")
+
+    def close(self):
+        self.page_break()
+        self.f.write("</body></html>\n")
+        self.f.close()
+
+
+# ─────────────────────────────────────
+# LaTeX
+# ─────────────────────────────────────
+TEX_SPECIAL = {
+    "\\": r"\textbackslash{}", "{": r"\{", "}": r"\}", "$": r"\$", "&": r"\&",
+    "#": r"\#", "^": r"\^{}", "_": r"\_", "%": r"\%", "~": r"\textasciitilde{}",
+}
+
+
+def tex_escape(text):
+    return "".join(TEX_SPECIAL.get(c, c) for c in text)
+
+
+class LaTeXWorksheet:
+    def __init__(self, path, title, answer_key):
+        self.answer_key = answer_key
+        self.f = open(path, "w", encoding="utf-8")
+        self.f.write(
+            "\\documentclass[11pt]{article}\n"
+            "\\usepackage[T1]{fontenc}\n"
+            "\\usepackage[utf8]{inputenc}\n"
+            "\\usepackage[margin=2cm]{geometry}\n"
+            "\\setlength{\\parindent}{0pt}\n"
+            "\\begin{document}\n"
+            f"\\section*{{{tex_escape(title)}}}\n"
+        )
+
+    def page_break(self):
+        self.f.write("\\newpage\n")
+
+    def heading(self, text):
+        self.f.write(f"\\subsection*{{{tex_escape(text)}}}\n")
+
+    def mcq(self, number, question):
+        f = self.f
+        f.write(f"\\begin{{minipage}}{{\\linewidth}}\n\\textbf{{{number}.}} {tex_escape(question['question'])}\n")
+        for kind, text in question["stem"]:
+            if kind == "code":
+                f.write(f"\\begin{{verbatim}}\n{text}\n\\end{{verbatim}}\n")
+            else:
+                f.write(f"\n{tex_escape(text)}\n")
+        if question["choices"]:
+            f.write("\\begin{itemize}\n")
+            for i, ch in enumerate(question["choices"]):
+                text = tex_escape(ch["text"])
+                if self.answer_key and ch["correct"]:
+                    text = f"\\textbf{{{text}}}"
+                f.write(f"\\item[{letter(i)})] {text}\n")
+                if self.answer_key and ch["explanation"]:
+                    f.write(f"\\\\ \\emph{{{tex_escape(ch['explanation'])}}}\n")
+            f.write("\\end{itemize}\n")
+        if self.answer_key:
+            answer = ", ".join(letter(i) for i, ch in enumerate(question["choices"]) if ch["correct"])
+            f.write(f"Answer: \\textbf{{{answer}}}\n")
+        f.write("\\end{minipage}\n\\bigskip\n\n")
+
+    def parsons(self, number, question):
+        f = self.f
+        lines, answer = printable_lines(question["expected"])
+        f.write(f"\\begin{{minipage}}{{\\linewidth}}\n\\textbf{{{number}.}} {tex_escape(question['title'])}\n")
+        if lines:
+            f.write("\\begin{itemize}\n")
+            if self.answer_key:
+                code = dict(lines)
+                for n, indent in answer:
+                    f.write(f"\\item[{n}.] \\hspace*{{{2 * indent}em}}\\texttt{{{tex_escape(code[n])}}}\n")
+            else:
+                for n, text in lines:
+                    f.write(f"\\item[{n}.] \\texttt{{{tex_escape(text)}}}\n")
+            f.write("\\end{itemize}\n")
+        if self.answer_key:
+            f.write(f"Answer: \\textbf{{{', '.join(str(n) for n, _ in answer)}}}\n")
+        else:
+            f.write("Correct order: \\rule{6cm}{0.4pt}\n")
+        f.write("\\end{minipage}\n\\bigskip\n\n")
+
+    def close(self):
+        self.f.write("\\end{document}\n")
+        self.f.close()
+
+
+# ─────────────────────────────────────
+# Builder
+# ─────────────────────────────────────
+class WorksheetBuilder(Builder):
+    name = "worksheet"
+    format = "worksheet"
+    epilog = "The worksheets and answer keys are in %(outdir)s."
+    allow_parallel = False
+
+    def init(self):
+        self.writers = []
+        self.number = 0
+
+    def get_outdated_docs(self):
+        # The worksheet covers the whole site, so every document is written.
+        return self.env.found_docs
+
+    def get_target_uri(self, docname, typ=None):
+        return ""
+
+    def prepare_writing(self, docnames):
+        os.makedirs(self.outdir, exist_ok=True)
+        title = self.config.project
+        self.writers = [
+            HTMLWorksheet(os.path.join(self.outdir, "worksheet.html"), f"{title} — Worksheet", False),
+            HTMLWorksheet(os.path.join(self.outdir, "answer-key.html"), f"{title} — Answer key", True),
+            LaTeXWorksheet(os.path.join(self.outdir, "worksheet.tex"), f"{title} — Worksheet", False),
+            LaTeXWorksheet(os.path.join(self.outdir, "answer-key.tex"), f"{title} — Answer key", True),
+        ]
+
+    def write_doc(self, docname, doctree):
+        per_page = self.config.worksheet_questions_per_page
+        first = True
+        for question in iter_questions(doctree):
+            if self.number and self.number % per_page == 0:
+                for w in self.writers:
+                    w.page_break()
+            if first:
+                title = self.env.titles[docname].astext() if docname in self.env.titles else docname
+                for w in self.writers:
+                    w.heading(title)
+                first = False
+
+            self.number += 1
+            for w in self.writers:
+                if question["type"] == "mcq":
+                    w.mcq(self.number, question)
+                else:
+                    w.parsons(self.number, question)
+
+    def finish(self):
+        for w in self.writers:
+            w.close()
+        logger.info(f"worksheet: wrote {self.number} questions")
+
+
+# ─────────────────────────────────────
+# Setup
+# ─────────────────────────────────────
+def setup(app):
+    app.add_config_value("worksheet_questions_per_page", 10, "")
+    app.add_builder(WorksheetBuilder)
+
+    return {"version": "1.0", "parallel_read_safe": True, "parallel_write_safe": True}
@@ -330,27 +330,110 @@ function check(container, source, targets, expected) {
     return;
   }
 
-  let allCorrect = true;
+  const result = gradeLines(expected, current);
 
   current.forEach((line, i) => {
-    line.li.classList.remove("line-correct", "line-incorrect");
-    const correct =
-      norm(line.text) === norm(expected[i].text) &&
-      line.indent === expected[i].indent &&
-      line.solutionLine === expected[i].solutionLine;
-
-    if (correct) line.li.classList.add("line-correct");
-    else {
-      line.li.classList.add("line-incorrect");
-      allCorrect = false;
-    }
+    const graded = result.lines[i];
+    line.li.classList.remove("line-correct", "line-incorrect", "line-indent-error");
+
+    if (graded.correct) line.li.classList.add("line-correct");
+    else if (!graded.placed) line.li.classList.add("line-incorrect");
+    else line.li.classList.add("line-indent-error");
   });
 
-  showMessage(container, allCorrect ? "✅ Correct!" : "✖ Try again", allCorrect);
+  const allCorrect = result.correct === expected.length && current.length === expected.length;
+  const percent = Math.round(result.score * 100);
+  const details = [];
+  if (result.misplaced) details.push(`${result.misplaced} out of order`);
+  if (result.indentErrors) details.push(`${result.indentErrors} wrongly indented`);
+
+  showMessage(
+    container,
+    allCorrect
+      ? "✅ Correct!"
+      : `✖ ${result.correct}/${expected.length} lines correct (${percent}%)` +
+        (details.length ? ` — ${details.join(", ")}` : ""),
+    allCorrect
+  );
   container.classList.toggle("parsons-correct", allCorrect);
   container.classList.toggle("parsons-incorrect", !allCorrect);
 }
 
+/* ============================================================
+   GRADING (partial credit)
+   Python reference: _ext/parsons/grading.py
+   - Lines with identical text are interchangeable: the k-th
+     submitted copy matches the k-th expected copy.
+   - Lines on the longest increasing subsequence of expected
+     positions are in order; the rest are the minimal set of
+     misplaced lines. O(n log n).
+   - Indentation is checked separately.
+   ============================================================ */
+function expectedPositions(expected, current) {
+  const slots = new Map();
+  expected.forEach((exp, idx) => {
+    const key = norm(exp.text);
+    if (!slots.has(key)) slots.set(key, { positions: [], next: 0 });
+    slots.get(key).positions.push(idx);
+  });
+
+  return current.map(line => {
+    const slot = slots.get(norm(line.text));
+    if (!slot || slot.next >= slot.positions.length) return null;
+    return slot.positions[slot.next++];
+  });
+}
+
+function longestIncreasingSubsequence(values) {
+  const tails = [];    // smallest tail value of a run of length k+1
+  const tailIdx = [];  // index into values of that tail
+  const prev = new Array(values.length).fill(-1);
+
+  values.forEach((v, i) => {
+    if (v === null) return;
+
+    let lo = 0, hi = tails.length;
+    while (lo < hi) {
+      const mid = (lo + hi) >> 1;
+      if (tails[mid] < v) lo = mid + 1;
+      else hi = mid;
+    }
+
+    tails[lo] = v;
+    tailIdx[lo] = i;
+    prev[i] = lo > 0 ? tailIdx[lo - 1] : -1;
+  });
+
+  const inOrder = new Set();
+  let i = tailIdx.length ? tailIdx[tailIdx.length - 1] : -1;
+  while (i !== -1) {
+    inOrder.add(i);
+    i = prev[i];
+  }
+  return inOrder;
+}
+
+function gradeLines(expected, current) {
+  const positions = expectedPositions(expected, current);
+  const inOrder = longestIncreasingSubsequence(positions);
+
+  const lines = current.map((line, i) => {
+    const pos = positions[i];
+    const placed = inOrder.has(i);
+    const indentOk = pos !== null && line.indent === expected[pos].indent;
+    return { placed, indentOk, correct: placed && indentOk };
+  });
+
+  const correct = lines.filter(l => l.correct).length;
+  return {
+    lines,
+    misplaced: lines.filter(l => !l.placed).length,
+    indentErrors: lines.filter(l => l.placed && !l.indentOk).length,
+    correct,
+    score: expected.length ? correct / expected.length : 1
+  };
+}
+
 /* ============================================================
    SOLUTION
    ============================================================ */
@@ -378,8 +461,8 @@ function showSolution(container, source, targets, expected) {
     li.appendChild(label);
     li.appendChild(pre);
 
-    const target = targets[exp.indent] || targets[0];
-    target.appendChild(li);
+    li.style.marginLeft = `${exp.indent * 2}em`;
+    targets[0].appendChild(li);
   });
 
   showMessage(container, "✨ Solution revealed", true);
@@ -8,7 +8,6 @@
 
 import os
 import sys
-import sphinx_rtd_theme
 
 project = "RTD_TESTING"
 copyright = "2025, GMC"
@@ -31,6 +30,10 @@ extensions = [
     "sphinx_design",
     "parsons.directive",  # our custom directive
     "mcq.mcq",  # custom directive
+    "lms_export.builder",  # make moodle / make qti
+    "worksheet.builder",  # make worksheet
+    "page_budget.report",  # per-page output size report
+    "quiz_search.index",  # search index for mcq/parsons content
 ]
 
 # "sphinx.ext.doctest",
@@ -102,6 +105,28 @@ html_js_files = [
     "parsons/parsons.js",
 ]
 
+# LMS export (make moodle / make qti): questions per output file
+lms_export_chunk_size = 500
+
+# Printable worksheet (make worksheet): questions per printed page
+worksheet_questions_per_page = 10
+
+# Per-page output budget (_build/html/page_budget.json). Pages over a limit,
+# or grown more than page_budget_max_growth_percent vs page_budget_baseline.json,
+# are warned about; -D page_budget_fail=1 makes that fail the build.
+# Refresh the baseline with -D page_budget_update_baseline=1 and commit it.
+page_budget = {
+    "html_bytes": 300_000,
+    "dom_nodes": 6_000,
+    "widgets": 60,
+    "asset_bytes": 1_500_000,
+}
+page_budget_max_growth_percent = 25
+page_budget_fail = False
+
+# Quiz search: questions per shard of _static/quiz-search/
+quiz_search_shard_size = 200
+
 # for rtd
 def setup(app):
     for css in ["css/custom.css", "parsons/parsons.css",]:
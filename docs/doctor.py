@@ -0,0 +1,160 @@
+"""
+Build startup doctor.
+
+    python doctor.py [--threshold MS]
+
+- Measures the cold import time of every extension in conf.py, each in a
+  fresh interpreter that has already imported Sphinx (what a build has
+  loaded anyway), using ``python -X importtime``.
+- Checks installed versions against requirements.txt, one targeted
+  lookup per package.
+- Flags slow extensions, extensions whose directives never appear in the
+  .rst sources, and top-level imports in conf.py that are never used.
+
+Exits 1 if a required package is missing or does not match its pin.
+"""
+import argparse
+import ast
+import os
+import re
+import subprocess
+import sys
+
+from req_checker import installed_version, read_requirements
+
+DOCS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Directives (or roles) that show an extension is in use. Extensions not
+# listed here (e.g. sphinx_copybutton) work without markup and are never
+# flagged as unused.
+EXTENSION_MARKUP = {
+    "sphinx.ext.autodoc": ["automodule", "autoclass", "autofunction", "automethod", "autodata", "autoattribute"],
+    "sphinx.ext.todo": ["todo", "todolist"],
+    "sphinx_togglebutton": ["toggle", ":class: toggle", ":class: dropdown"],
+    "sphinx_design": ["grid", "card", "tab-set", "tab-item", "dropdown", "button-link", "button-ref", "badge"],
+    "parsons.directive": ["parsons"],
+    "mcq.mcq": ["mcq"],
+}
+
+
+def read_conf(path):
+    """Return ``(extensions, unused_imports)`` from conf.py without executing it."""
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), path)
+
+    extensions = []
+    imported = {}
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(
+            isinstance(t, ast.Name) and t.id == "extensions" for t in node.targets
+        ):
+            extensions = [ast.literal_eval(elt) for elt in node.value.elts]
+        elif isinstance(node, ast.Import):
+            for alias in node.names:
+                imported[alias.asname or alias.name.split(".")[0]] = alias.name
+        elif isinstance(node, ast.ImportFrom):
+            for alias in node.names:
+                imported[alias.asname or alias.name] = f"{node.module}.{alias.name}"
+
+    used = {n.id for n in ast.walk(tree) if isinstance(n, ast.Name)}
+    unused = sorted(module for name, module in imported.items() if name not in used)
+    return extensions, unused
+
+
+def cold_import_ms(module):
+    """
+    Cumulative import time of ``module`` in a fresh interpreter, in ms.
+
+    ``None`` if it was already imported by ``sphinx.application`` (so it
+    costs nothing extra). Raises ``CalledProcessError`` if the import fails.
+    """
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [os.path.join(DOCS_DIR, "_ext"), env.get("PYTHONPATH")]))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import sphinx.application; import {module}"],
+        cwd=DOCS_DIR, env=env, capture_output=True, text=True, check=True,
+    )
+
+    # Lines look like "import time:  self [us] | cumulative | package";
+    # children are listed before their parent, so only lines after the
+    # sphinx.application line belong to the module import. The last line
+    # naming the module is its outermost import.
+    cumulative = None
+    for line in result.stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) != 3:
+            continue
+        if parts[2].strip() == "sphinx.application":
+            cumulative = None
+        elif parts[2].strip() == module:
+            cumulative = int(parts[1])
+    return None if cumulative is None else cumulative / 1000
+
+
+def used_markup(sources_dir):
+    """All ``.. name::`` directives and ``:class:`` options used in the .rst sources."""
+    found = set()
+    pattern = re.compile(r"^\s*\.\.\s+([\w-]+)::|^\s*(:class:\s*[\w-]+)", re.M)
+    for root, dirs, files in os.walk(sources_dir):
+        dirs[:] = [d for d in dirs if not d.startswith(("_", "."))]
+        for name in files:
+            if name.endswith(".rst"):
+                with open(os.path.join(root, name), encoding="utf-8") as f:
+                    for directive, option in pattern.findall(f.read()):
+                        found.add(directive or " ".join(option.split()))
+    return found
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--threshold", type=float, default=100.0,
+                        help="flag extensions slower than this to import (ms, default 100)")
+    args = parser.parse_args(argv)
+
+    ok = True
+    extensions, unused_imports = read_conf(os.path.join(DOCS_DIR, "conf.py"))
+    markup = used_markup(DOCS_DIR)
+
+    print("Extension import times (cold, after Sphinx):")
+    for ext in extensions:
+        notes = []
+        try:
+            ms = cold_import_ms(ext)
+        except subprocess.CalledProcessError:
+            ms = None
+            notes.append("IMPORT FAILED")
+            ok = False
+        else:
+            if ms is None:
+                notes.append("preloaded by Sphinx")
+            elif ms > args.threshold:
+                notes.append("slow")
+        if ext in EXTENSION_MARKUP and not markup.intersection(EXTENSION_MARKUP[ext]):
+            notes.append("possibly unused: no matching directives in the .rst sources")
+        timing = "   n/a   " if ms is None else f"{ms:7.1f} ms"
+        print(f"  {timing}  {ext}" + (f"  <- {', '.join(notes)}" if notes else ""))
+
+    if unused_imports:
+        print("\nUnused imports in conf.py (cost import time on every build):")
+        for module in unused_imports:
+            print(f"  {module}")
+
+    print("\nRequirements:")
+    for pkg, pin, noted in read_requirements(os.path.join(DOCS_DIR, "requirements.txt")):
+        version = installed_version(pkg)
+        if version is None:
+            print(f"  {pkg}: NOT INSTALLED")
+            ok = False
+        elif pin and version != pin:
+            print(f"  {pkg}=={version}  <- requirements.txt pins {pin}")
+            ok = False
+        elif noted and version != noted:
+            print(f"  {pkg}=={version}  (requirements.txt notes {noted})")
+        else:
+            print(f"  {pkg}=={version}")
+
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
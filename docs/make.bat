@@ -25,9 +25,16 @@ if errorlevel 9009 (
 
 if "%1" == "" goto help
 
+if "%1" == "doctor" goto doctor
+
 %SPHINXBUILD% -M %1 %SOURCEDIR% %BUILDDIR% %SPHINXOPTS% %O%
 goto end
 
+:doctor
+REM Import-time and requirements check for the configured extensions.
+python doctor.py
+goto end
+
 :help
 %SPHINXBUILD% -M help %SOURCEDIR% %BUILDDIR% %SPHINXOPTS% %O%
 
@@ -1,33 +1,49 @@
+import os
 import importlib.metadata
 
-import importlib.metadata
 
-def show_installed_requirements(requirements_file="requirements.txt"):
-    # Read package names from requirements.txt
+def read_requirements(requirements_file="requirements.txt"):
+    """
+    Read requirements.txt into a list of ``(name, pin, noted)`` tuples.
+
+    ``pin`` is an active ``==`` version, ``noted`` a version kept in a
+    comment (``sphinx-copybutton  #==0.5.2``); either may be None.
+    """
+    required = []
     with open(requirements_file) as f:
-        required = []
         for line in f:
             line = line.strip()
             if not line or line.startswith("#"):
                 continue
-            # Remove inline comments after '#'
-            line = line.split("#", 1)[0].strip()
+            # Split off inline comments after '#'
+            line, _, comment = line.partition("#")
+            line = line.strip()
             if not line:
                 continue
             # Split off version specifier if present
-            pkg = line.split("==")[0].strip()
-            required.append(pkg)
+            pkg, _, pin = line.partition("==")
+            noted = comment.strip().lstrip("=").strip() if comment.strip().startswith("==") else None
+            required.append((pkg.strip(), pin.strip() or None, noted))
+    return required
 
-    # Get all installed packages
-    installed = {dist.metadata["Name"]: dist.version for dist in importlib.metadata.distributions()}
 
-    # Print only those that are in requirements.txt
-    for pkg in required:
-        if pkg in installed:
-            print(f"{pkg}=={installed[pkg]}")
+def installed_version(pkg):
+    """Version of one installed distribution, or None (a single targeted lookup)."""
+    try:
+        return importlib.metadata.version(pkg)
+    except importlib.metadata.PackageNotFoundError:
+        return None
+
+
+def show_installed_requirements(requirements_file="requirements.txt"):
+    for pkg, _, _ in read_requirements(requirements_file):
+        version = installed_version(pkg)
+        if version:
+            print(f"{pkg}=={version}")
         else:
             print(f"{pkg} (not installed)")
 
+
 if __name__ == "__main__":
-    req_file_path = r"C:\Users\gmccarthy\Documents\PC_RTD_GITHUB_resources\RTD_TESTING\docs\requirements.txt"
+    req_file_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "requirements.txt")
     show_installed_requirements(req_file_path)